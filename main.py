@@ -1,15 +1,31 @@
-import json
-import subprocess
+import asyncio
+import base64
+import functools
+import os
 import re
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
+
+import msgspec
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from pydantic import BaseModel
 
+try:
+    import ahocorasick
+except ImportError:  # optional; fold_line falls back to one str.find per variation
+    ahocorasick = None
+
 app = FastAPI()
 
+# Lines longer than this are folded around the match (or truncated)
+FOLD_MAX_LEN = 1000
+
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
@@ -25,21 +41,60 @@ class SearchRequest(BaseModel):
     fold: bool = True
 
 
-class Match(BaseModel):
-    line_number: int
-    content: str
-    is_match: bool = False
-    file_path: Optional[str] = None
+# Typed view of the `rg --json` events we read. Only the fields we use are
+# declared; msgspec skips the rest without building objects for them.
+class RgText(msgspec.Struct):
+    text: Optional[str] = None
+    # rg sends base64 under "bytes" instead of "text" when data isn't UTF-8
+    raw: Optional[str] = msgspec.field(default=None, name="bytes")
+
+    def decoded(self) -> str:
+        if self.text is not None:
+            return self.text
+        if self.raw is not None:
+            return base64.b64decode(self.raw).decode("utf-8", errors="replace")
+        return ""
+
+
+class RgData(msgspec.Struct):
+    path: Optional[RgText] = None
+    lines: Optional[RgText] = None
+    line_number: Optional[int] = None
+
 
+class RgEvent(msgspec.Struct):
+    type: str
+    data: RgData
 
-class SearchResult(BaseModel):
-    matches: List[Match]
-    total_matches: int
-    original_query: str
-    command_executed: str
+
+_RG_DECODER = msgspec.json.Decoder(RgEvent)
+
+
+# Successful path validations are reused for a few seconds, since the UI
+# scopes and then searches the same path back to back
+SEARCH_PATH_TTL = 5.0
+SEARCH_PATH_CACHE_SIZE = 128
+_SEARCH_PATH_CACHE: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
 
 
 def validate_search_path(search_path: str) -> str:
+    """Validate and sanitize the search path, reusing recent results."""
+    now = time.monotonic()
+    cached = _SEARCH_PATH_CACHE.get(search_path)
+    if cached is not None and now - cached[0] < SEARCH_PATH_TTL:
+        _SEARCH_PATH_CACHE.move_to_end(search_path)
+        return cached[1]
+
+    # Failures raise and are never cached, so a fixed path works right away
+    safe_path = _validate_search_path(search_path)
+    _SEARCH_PATH_CACHE[search_path] = (now, safe_path)
+    _SEARCH_PATH_CACHE.move_to_end(search_path)
+    if len(_SEARCH_PATH_CACHE) > SEARCH_PATH_CACHE_SIZE:
+        _SEARCH_PATH_CACHE.popitem(last=False)
+    return safe_path
+
+
+def _validate_search_path(search_path: str) -> str:
     """Validate and sanitize the search path to prevent command injection."""
     # Resolve to absolute path and normalize
     resolved = Path(search_path).resolve()
@@ -62,73 +117,96 @@ def validate_search_path(search_path: str) -> str:
     return str(resolved)
 
 
+_RG_ESCAPE_RE = re.compile(r"([\\.^$*+?{}\[\]|()])")
+
+
+@functools.lru_cache(maxsize=4096)
 def rg_escape(text: str) -> str:
     """Escape characters that are special in ripgrep's Rust regex engine."""
-    special = set(r"\.^$*+?{}[]|()")
-    return "".join("\\" + c if c in special else c for c in text)
+    return _RG_ESCAPE_RE.sub(r"\\\1", text)
+
+
+_NON_DIGIT_RE = re.compile(r"\D")
 
 
 def generate_variations(query: str, query_type: str) -> List[str]:
     variations = [query]
     if query_type == "phone":
         # Remove all non-digits
-        digits = re.sub(r"\D", "", query)
+        digits = _NON_DIGIT_RE.sub("", query)
         if len(digits) >= 10:
             # Assuming US format for now: 1234567890
-            # 123-456-7890
-            variations.append(f"{digits[:3]}-{digits[3:6]}-{digits[6:]}")
-            # 1234567890
-            variations.append(digits)
-            # (123)456-7890
-            variations.append(f"({digits[:3]}){digits[3:6]}-{digits[6:]}")
-            # (123) 456-7890
-            variations.append(f"({digits[:3]}) {digits[3:6]}-{digits[6:]}")
-            # 123.456.7890
-            variations.append(f"{digits[:3]}.{digits[3:6]}.{digits[6:]}")
-            # 123 456-7890
-            variations.append(f"{digits[:3]} {digits[3:6]}-{digits[6:]}")
+            a, b, c = digits[:3], digits[3:6], digits[6:]
+            variations += [
+                f"{a}-{b}-{c}",  # 123-456-7890
+                digits,  # 1234567890
+                f"({a}){b}-{c}",  # (123)456-7890
+                f"({a}) {b}-{c}",  # (123) 456-7890
+                f"{a}.{b}.{c}",  # 123.456.7890
+                f"{a} {b}-{c}",  # 123 456-7890
+            ]
     elif query_type == "name":
         parts = query.strip().split()
         if len(parts) == 2:
             first, last = parts
-            variations.append(f"{first} {last}")
-            variations.append(f"{last}, {first}")
-            variations.append(f"{last},{first}")
+            variations += [
+                f"{first} {last}",
+                f"{last}, {first}",
+                f"{last},{first}",
+            ]
         elif len(parts) >= 3:
             first, middle, last = parts[0], " ".join(parts[1:-1]), parts[-1]
             mi = parts[1][0]
-            # First + last only (no middle)
-            variations.append(f"{first} {last}")
-            variations.append(f"{last}, {first}")
-            variations.append(f"{last},{first}")
-            # Space-separated orderings with middle
-            variations.append(f"{first} {middle} {last}")
-            variations.append(f"{first} {mi}. {last}")
-            variations.append(f"{first} {mi} {last}")
-            variations.append(f"{last}, {first} {middle}")
-            variations.append(f"{last}, {first} {mi}")
-            variations.append(f"{last}, {first} {mi}.")
-            # Comma-separated (CSV) orderings
-            variations.append(f"{first},{middle},{last}")
-            variations.append(f"{first},{mi},{last}")
-            variations.append(f"{last},{first},{middle}")
-            variations.append(f"{last},{first},{mi}")
+            variations += [
+                # First + last only (no middle)
+                f"{first} {last}",
+                f"{last}, {first}",
+                f"{last},{first}",
+                # Space-separated orderings with middle
+                f"{first} {middle} {last}",
+                f"{first} {mi}. {last}",
+                f"{first} {mi} {last}",
+                f"{last}, {first} {middle}",
+                f"{last}, {first} {mi}",
+                f"{last}, {first} {mi}.",
+                # Comma-separated (CSV) orderings
+                f"{first},{middle},{last}",
+                f"{first},{mi},{last}",
+                f"{last},{first},{middle}",
+                f"{last},{first},{mi}",
+            ]
     elif query_type == "email":
         # Just the query for now, maybe case variations? rg is case sensitive
         pass
     elif query_type == "generic":
         # Auto-detect: if mostly digits, treat as phone; if 2-3 words, treat as name
         stripped = query.strip()
-        digits_only = re.sub(r"\D", "", stripped)
+        digits_only = _NON_DIGIT_RE.sub("", stripped)
         words = stripped.split()
         if len(digits_only) >= 7 and len(digits_only) / max(len(stripped), 1) > 0.5:
             variations = generate_variations(query, "phone")
         elif len(words) in (2, 3) and all(w.replace(".", "").isalpha() for w in words):
             variations = generate_variations(query, "name")
-    return list(set(variations))
-
-
-def fold_line(line: str, query_variations: List[str], max_len: int = 1000) -> str:
+    return list(dict.fromkeys(variations))
+
+
+def build_variation_automaton(lowered_variations: Sequence[Tuple[str, int]]):
+    """Build an Aho-Corasick automaton over the lowered variations, if available."""
+    if ahocorasick is None or not lowered_variations:
+        return None
+    automaton = ahocorasick.Automaton()
+    for v_lower, _ in lowered_variations:
+        automaton.add_word(v_lower, len(v_lower))
+    automaton.make_automaton()
+    return automaton
+
+
+def fold_line(
+    line: str,
+    lowered_variations: Sequence[Tuple[str, int]],
+    max_len: int = FOLD_MAX_LEN,
+    automaton=None,
+) -> str:
     # A simple fold strategy: keep the match and some surrounding context
     # This is a bit complex to do perfectly with multiple variations,
     # so we'll start by just checking if line is too long.
@@ -138,10 +216,19 @@ def fold_line(line: str, query_variations: List[str], max_len: int = 1000) -> st
     # Try to find the match index
     min_idx = len(line)
     line_lower = line.lower()
-    for var in query_variations:
-        idx = line_lower.find(var.lower())
-        if idx != -1 and idx < min_idx:
-            min_idx = idx
+    if automaton is not None:
+        # Single pass over the line; hits come back in order of where they end
+        for end_idx, v_len in automaton.iter(line_lower):
+            min_idx = end_idx - v_len + 1
+            break
+    else:
+        # Any hit is close enough to center a FOLD_MAX_LEN window on, so stop
+        # at the first (longest) variation found rather than the earliest
+        for v_lower, _ in lowered_variations:
+            idx = line_lower.find(v_lower)
+            if idx != -1:
+                min_idx = idx
+                break
 
     if min_idx == len(line):
         # No match found in this line (might be context line), just truncate
@@ -165,28 +252,33 @@ def fold_line(line: str, query_variations: List[str], max_len: int = 1000) -> st
     return f"{prefix}{line[start:end]}{suffix}"
 
 
-def prepare_search_command(request: SearchRequest):
-    # Validate and sanitize the search path
-    safe_path = validate_search_path(request.search_path)
+@functools.lru_cache(maxsize=512)
+def _build_cmd(
+    queries_key: Tuple[Tuple[str, str], ...], safe_path: str, context: int
+) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    """Build the rg argv, variation list and stdin patterns for a request signature.
 
+    This is pure, so it is memoized: the UI re-requests the same plan on
+    every keystroke via /search/preview.
+    """
     all_variations = []
     regex_patterns = []  # Additional regex patterns (e.g. name wildcards)
 
-    for item in request.queries:
-        variations = generate_variations(item.query, item.type)
+    for query, query_type in queries_key:
+        variations = generate_variations(query, query_type)
         all_variations.extend(variations)
 
         # For name queries, add regex wildcards to catch any middle name/initial
         # Apply for explicit "name" type or generic auto-detected as name
-        is_name_query = item.type == "name"
-        if item.type == "generic":
-            words = item.query.strip().split()
+        is_name_query = query_type == "name"
+        if query_type == "generic":
+            words = query.strip().split()
             is_name_query = len(words) in (2, 3) and all(
                 w.replace(".", "").isalpha() for w in words
             )
 
         if is_name_query:
-            parts = item.query.strip().split()
+            parts = query.strip().split()
             first, last = parts[0], parts[-1]
             ef, el = rg_escape(first), rg_escape(last)
             # "John <middle> Smith" or "John,<middle>,Smith"
@@ -194,29 +286,77 @@ def prepare_search_command(request: SearchRequest):
             # "Smith, John <middle>" or "Smith,John,<middle>"
             regex_patterns.append(f"{el}[,\\s]+{ef}[,\\s]+\\S+")
 
-    # Deduplicate global variations
-    all_variations = list(set(all_variations))
-
-    cmd = ["rg", "--json", "-i", "--max-count", "10000"]
-    # Add literal variations escaped for rg regex
-    for var in all_variations:
-        cmd.extend(["-e", rg_escape(var)])
-    # Add regex wildcard patterns (for name matching with unknown middle names)
-    for pat in regex_patterns:
-        cmd.extend(["-e", pat])
-
-    cmd.extend(["-C", str(request.context)])
+    # Deduplicate global variations (and repeated name wildcards) before any
+    # escaping, keeping first-seen order
+    all_variations = list(dict.fromkeys(all_variations))
+    regex_patterns = list(dict.fromkeys(regex_patterns))
+
+    # --no-config skips reading RIPGREP_CONFIG_PATH on every spawn and keeps the
+    # command independent of the server user's rg config
+    cmd = ["rg", "--no-config", "--no-messages", "--json", "-i", "--max-count", "10000"]
+    pattern_lines = ()
+    if not regex_patterns:
+        # Pure literal search: hand rg the whole literal set on stdin with -F so
+        # it can build one literal matcher instead of parsing a regex per -e.
+        # stdin rather than a temp file keeps the cached argv valid.
+        cmd.extend(["-F", "-f", "-"])
+        pattern_lines = tuple(all_variations)
+    else:
+        # -F applies to every pattern, so with wildcards present the literal
+        # variations go in as a single escaped alternation instead
+        cmd.extend(["-e", "(?:" + "|".join(map(rg_escape, all_variations)) + ")"])
+        # Add regex wildcard patterns (for name matching with unknown middle names)
+        for pat in regex_patterns:
+            cmd.extend(["-e", pat])
+
+    cmd.extend(["-C", str(context)])
 
     # Use the validated search path
     cmd.append(safe_path)
 
-    return cmd, all_variations
+    return tuple(cmd), tuple(all_variations), pattern_lines
+
+
+@functools.lru_cache(maxsize=512)
+def _build_matcher(all_variations: Tuple[str, ...]):
+    # Lowercase once per plan so fold_line doesn't redo it for every line.
+    # Longest (most specific) first, since fold_line stops at the first hit.
+    lowered_variations = tuple(
+        sorted(((v.lower(), len(v)) for v in all_variations), key=lambda x: -x[1])
+    )
+    return lowered_variations, build_variation_automaton(lowered_variations)
+
+
+def prepare_search_command(request: SearchRequest):
+    # Validate and sanitize the search path
+    safe_path = validate_search_path(request.search_path)
+
+    queries_key = tuple((item.query, item.type) for item in request.queries)
+    cmd, all_variations, pattern_lines = _build_cmd(
+        queries_key, safe_path, request.context
+    )
+    lowered_variations, automaton = _build_matcher(all_variations)
+
+    return (
+        list(cmd),
+        list(all_variations),
+        lowered_variations,
+        automaton,
+        pattern_lines,
+    )
 
 
-def format_command_for_display(cmd: List[str]) -> str:
+def format_command_for_display(
+    cmd: List[str], pattern_lines: Sequence[str] = ()
+) -> str:
     # Custom formatter to enforce single quotes around -e arguments' values for display
     # Re-impl strategy: iterate and format
     formatted = []
+    if pattern_lines:
+        # Patterns fed on stdin (-f -) are shown as a printf pipeline
+        formatted.append("printf '%s\\n'")
+        formatted.extend(f"'{p}'" for p in pattern_lines)
+        formatted.append("|")
     skip_next = False
     for j, arg in enumerate(cmd):
         if skip_next:
@@ -239,11 +379,178 @@ def format_command_for_display(cmd: List[str]) -> str:
     return " ".join(formatted)
 
 
+# /search/stream flushes after this many buffered events or bytes, or once
+# buffered events have waited this many seconds since the last send
+STREAM_FLUSH_EVENTS = 64
+STREAM_FLUSH_BYTES = 16 * 1024
+STREAM_FLUSH_INTERVAL = 0.05
+
+# Generous per-line limit so megabyte-long matched lines still get through
+RG_LINE_LIMIT = 16 * 1024 * 1024
+
+
+async def _iter_with_idle_ticks(agen, interval: float):
+    """Yield items from agen, plus None whenever interval passes without one."""
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(agen.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=interval)
+            if not done:
+                yield None
+                continue
+            finished, pending = pending, None
+            try:
+                item = finished.result()
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await agen.aclose()
+
+
+async def _run_rg(cmd: List[str], pattern_lines: Sequence[str] = ()):
+    """Run one rg process and yield its stdout line by line."""
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=(
+            asyncio.subprocess.PIPE if pattern_lines else asyncio.subprocess.DEVNULL
+        ),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        cwd=".",
+        limit=RG_LINE_LIMIT,
+    )
+    try:
+        if pattern_lines:
+            process.stdin.write(("\n".join(pattern_lines) + "\n").encode())
+            await process.stdin.drain()
+            process.stdin.close()
+        while True:
+            try:
+                line = await process.stdout.readline()
+            except ValueError:
+                # Line exceeded RG_LINE_LIMIT and was discarded by the reader
+                continue
+            if not line:
+                break
+            yield line
+        await process.wait()
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+
+# Search directories with more than this many subdirectories using one rg
+# process per group of subdirectories, up to SHARD_MAX_PROCESSES groups
+SHARD_MIN_DIRS = 4
+SHARD_MAX_PROCESSES = os.cpu_count() or 4
+# Searcher threads split across a sharded search's rg processes
+SHARD_TOTAL_THREADS = os.cpu_count() or 4
+# Per-file result blocks buffered between shard readers and the consumer
+SHARD_QUEUE_SIZE = 64
+
+# Any of these at or above the search path means rg may be filtering the tree
+_IGNORE_MARKERS = (".git", ".gitignore", ".ignore", ".rgignore")
+
+
+def _shard_search_paths(search_path: str) -> Optional[List[List[str]]]:
+    """Split a directory's subdirectories into groups for parallel rg runs.
+
+    Returns None when sharding isn't worthwhile or could change the results:
+    paths given to rg explicitly bypass ignore files, so trees where an
+    ignore file might apply are left to a single rg process.
+    """
+    if not os.path.isdir(search_path):
+        return None
+    for parent in (search_path, *map(str, Path(search_path).parents)):
+        if any(os.path.exists(os.path.join(parent, m)) for m in _IGNORE_MARKERS):
+            return None
+    try:
+        with os.scandir(search_path) as it:
+            # rg skips hidden entries and doesn't follow symlinks by default
+            dirs = sorted(
+                e.path
+                for e in it
+                if not e.name.startswith(".") and e.is_dir(follow_symlinks=False)
+            )
+    except OSError:
+        return None
+    n = min(len(dirs), SHARD_MAX_PROCESSES)
+    if len(dirs) <= SHARD_MIN_DIRS or n < 2:
+        return None
+    return [dirs[i::n] for i in range(n)]
+
+
+async def iter_rg_lines(cmd: List[str], pattern_lines: Sequence[str] = ()):
+    """Run rg and yield its stdout line by line without blocking the event loop.
+
+    pattern_lines, if given, are written to rg's stdin for ``-f -``. Wide
+    directories are searched by several rg processes at once (see
+    _shard_search_paths); their output is merged a whole file at a time.
+    """
+    search_path = cmd[-1]
+    # Walking up the parents and listing the directory are blocking syscalls
+    shards = await asyncio.to_thread(_shard_search_paths, search_path)
+    if shards is None:
+        async for line in _run_rg(cmd, pattern_lines):
+            yield line
+        return
+
+    # One process for the files directly under search_path, one per group.
+    # Split the thread budget between them instead of letting each rg start
+    # its own full-size pool.
+    threads = max(1, SHARD_TOTAL_THREADS // (len(shards) + 1))
+    base = cmd[:-1] + ["-j", str(threads)]
+    shard_cmds = [base + ["--max-depth", "1", search_path]]
+    shard_cmds += [base + group for group in shards]
+    queue = asyncio.Queue(maxsize=SHARD_QUEUE_SIZE)
+
+    async def pump(shard_cmd: List[str]):
+        block = []
+        try:
+            async for line in _run_rg(shard_cmd, pattern_lines):
+                block.append(line)
+                # rg brackets each file's events with begin/end; forward whole
+                # files so one file's lines never interleave with another's
+                if line.startswith(b'{"type":"end"'):
+                    await queue.put(block)
+                    block = []
+            if block:
+                await queue.put(block)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(None)
+
+    tasks = [asyncio.create_task(pump(c)) for c in shard_cmds]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            block = await queue.get()
+            if block is None:
+                remaining -= 1
+            elif isinstance(block, Exception):
+                raise block
+            else:
+                for line in block:
+                    yield line
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 @app.post("/search/preview")
 async def search_preview(request: SearchRequest):
     try:
-        cmd, _ = prepare_search_command(request)
-        command_str = format_command_for_display(cmd)
+        cmd, _, _, _, pattern_lines = prepare_search_command(request)
+        command_str = format_command_for_display(cmd, pattern_lines)
         return {"command_executed": command_str}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -252,62 +559,75 @@ async def search_preview(request: SearchRequest):
 @app.post("/search")
 async def search(request: SearchRequest):
     try:
-        cmd, all_variations = prepare_search_command(request)
+        (
+            cmd,
+            all_variations,
+            lowered_variations,
+            automaton,
+            pattern_lines,
+        ) = prepare_search_command(request)
 
         # Create a display string for the command
-        command_str = format_command_for_display(cmd)
-
-        process = subprocess.run(cmd, capture_output=True, text=True, cwd=".")
+        command_str = format_command_for_display(cmd, pattern_lines)
 
-        output_lines = process.stdout.splitlines()
         matches_count = 0
 
-        # Parse rg --json output
+        # Parse rg --json output as it arrives instead of buffering all of stdout
 
         processed_matches = []
 
-        for line in output_lines:
+        async for line in iter_rg_lines(cmd, pattern_lines):
             try:
-                data = json.loads(line)
-                if data["type"] == "match":
+                rg_event = _RG_DECODER.decode(line)
+                if rg_event.type == "match":
                     matches_count += 1
-                    content = data["data"]["lines"]["text"].rstrip()
-                    file_path = data["data"]["path"]["text"]
-                    if request.fold:
-                        content = fold_line(content, all_variations)
-                    processed_matches.append(
-                        Match(
-                            line_number=data["data"]["line_number"],
-                            content=content,
-                            is_match=True,
-                            file_path=file_path,
+                    content = rg_event.data.lines.decoded().rstrip()
+                    file_path = rg_event.data.path.decoded()
+                    if request.fold and len(content) > FOLD_MAX_LEN:
+                        content = fold_line(
+                            content, lowered_variations, automaton=automaton
                         )
+                    # Plain dicts: skip pydantic validation for every matched line
+                    processed_matches.append(
+                        {
+                            "line_number": rg_event.data.line_number,
+                            "content": content,
+                            "is_match": True,
+                            "file_path": file_path,
+                        }
                     )
-                elif data["type"] == "context":
-                    content = data["data"]["lines"]["text"].rstrip()
-                    file_path = data["data"]["path"]["text"]
+                elif rg_event.type == "context":
+                    content = rg_event.data.lines.decoded().rstrip()
+                    file_path = rg_event.data.path.decoded()
                     if request.fold:
                         # Context usually doesn't have the match, so standard truncate
-                        if len(content) > 1000:
-                            content = content[:1000] + "..."
+                        if len(content) > FOLD_MAX_LEN:
+                            content = content[:FOLD_MAX_LEN] + "..."
                     processed_matches.append(
-                        Match(
-                            line_number=data["data"]["line_number"],
-                            content=content,
-                            is_match=False,
-                            file_path=file_path,
-                        )
+                        {
+                            "line_number": rg_event.data.line_number,
+                            "content": content,
+                            "is_match": False,
+                            "file_path": file_path,
+                        }
                     )
-            except json.JSONDecodeError:
+            except msgspec.DecodeError:
                 continue
 
-        return {
-            "matches": processed_matches,
-            "total_matches": matches_count,
-            "original_query": str([q.query for q in request.queries]),
-            "variations": all_variations,
-            "command_executed": command_str,
-        }
+        # Encode directly with orjson; returning the dict would run FastAPI's
+        # jsonable_encoder over every match first
+        return Response(
+            orjson.dumps(
+                {
+                    "matches": processed_matches,
+                    "total_matches": matches_count,
+                    "original_query": str([q.query for q in request.queries]),
+                    "variations": all_variations,
+                    "command_executed": command_str,
+                }
+            ),
+            media_type="application/json",
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -316,94 +636,109 @@ async def search(request: SearchRequest):
 @app.post("/search/stream")
 async def search_stream(request: SearchRequest):
     """Stream search results as newline-delimited JSON events."""
-    cmd, all_variations = prepare_search_command(request)
-    command_str = format_command_for_display(cmd)
-
-    def generate():
+    (
+        cmd,
+        all_variations,
+        lowered_variations,
+        automaton,
+        pattern_lines,
+    ) = prepare_search_command(request)
+    command_str = format_command_for_display(cmd, pattern_lines)
+
+    async def generate():
         # First event: preview with command and variations
-        yield (
-            json.dumps(
-                {
-                    "event": "preview",
-                    "command_executed": command_str,
-                    "variations": all_variations,
-                }
-            )
-            + "\n"
-        )
-
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            cwd=".",
-            bufsize=1,
-        )
+        yield orjson.dumps(
+            {
+                "event": "preview",
+                "command_executed": command_str,
+                "variations": all_variations,
+            }
+        ) + b"\n"
 
         matches_count = 0
+        # Coalesce events so each ASGI send carries many lines, not one
+        buf = bytearray()
+        buffered = 0
+        last_flush = time.monotonic()
+        lines = _iter_with_idle_ticks(
+            iter_rg_lines(cmd, pattern_lines), STREAM_FLUSH_INTERVAL
+        )
         try:
-            for line in process.stdout:
+            async for line in lines:
+                if line is None:
+                    # rg is quiet; don't sit on events the client is waiting for
+                    if buf:
+                        yield bytes(buf)
+                        buf.clear()
+                        buffered = 0
+                        last_flush = time.monotonic()
+                    continue
                 try:
-                    data = json.loads(line)
-                    if data["type"] == "match":
+                    rg_event = _RG_DECODER.decode(line)
+                    if rg_event.type == "match":
                         matches_count += 1
-                        content = data["data"]["lines"]["text"].rstrip()
-                        file_path = data["data"]["path"]["text"]
-                        if request.fold:
-                            content = fold_line(content, all_variations)
-                        yield (
-                            json.dumps(
-                                {
-                                    "event": "match",
-                                    "line_number": data["data"]["line_number"],
-                                    "content": content,
-                                    "is_match": True,
-                                    "file_path": file_path,
-                                    "count": matches_count,
-                                }
-                            )
-                            + "\n"
-                        )
-                    elif data["type"] == "context":
-                        content = data["data"]["lines"]["text"].rstrip()
-                        file_path = data["data"]["path"]["text"]
-                        if request.fold and len(content) > 1000:
-                            content = content[:1000] + "..."
-                        yield (
-                            json.dumps(
-                                {
-                                    "event": "context",
-                                    "line_number": data["data"]["line_number"],
-                                    "content": content,
-                                    "is_match": False,
-                                    "file_path": file_path,
-                                    "count": matches_count,
-                                }
+                        content = rg_event.data.lines.decoded().rstrip()
+                        file_path = rg_event.data.path.decoded()
+                        if request.fold and len(content) > FOLD_MAX_LEN:
+                            content = fold_line(
+                                content, lowered_variations, automaton=automaton
                             )
-                            + "\n"
-                        )
-                except json.JSONDecodeError:
+                        event = {
+                            "event": "match",
+                            "line_number": rg_event.data.line_number,
+                            "content": content,
+                            "is_match": True,
+                            "file_path": file_path,
+                            "count": matches_count,
+                        }
+                    elif rg_event.type == "context":
+                        content = rg_event.data.lines.decoded().rstrip()
+                        file_path = rg_event.data.path.decoded()
+                        if request.fold and len(content) > FOLD_MAX_LEN:
+                            content = content[:FOLD_MAX_LEN] + "..."
+                        event = {
+                            "event": "context",
+                            "line_number": rg_event.data.line_number,
+                            "content": content,
+                            "is_match": False,
+                            "file_path": file_path,
+                            "count": matches_count,
+                        }
+                    else:
+                        continue
+                except msgspec.DecodeError:
                     continue
 
-            process.wait()
+                buf += orjson.dumps(event)
+                buf += b"\n"
+                buffered += 1
+                if (
+                    buffered >= STREAM_FLUSH_EVENTS
+                    or len(buf) >= STREAM_FLUSH_BYTES
+                    or time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL
+                ):
+                    yield bytes(buf)
+                    buf.clear()
+                    buffered = 0
+                    last_flush = time.monotonic()
         except Exception:
-            process.kill()
-            process.wait()
-
-        # Final event: done
-        yield (
-            json.dumps(
-                {
-                    "event": "done",
-                    "total_matches": matches_count,
-                    "original_query": str([q.query for q in request.queries]),
-                    "variations": all_variations,
-                    "command_executed": command_str,
-                }
-            )
-            + "\n"
+            # rg died mid-stream; still send the done event below
+            pass
+        finally:
+            await lines.aclose()
+
+        # Final event: done, flushed together with anything still buffered
+        buf += orjson.dumps(
+            {
+                "event": "done",
+                "total_matches": matches_count,
+                "original_query": str([q.query for q in request.queries]),
+                "variations": all_variations,
+                "command_executed": command_str,
+            }
         )
+        buf += b"\n"
+        yield bytes(buf)
 
     from starlette.responses import StreamingResponse
 
@@ -414,6 +749,65 @@ class PathInfoRequest(BaseModel):
     search_path: str = "."
 
 
+# Stop scoping huge trees after this many files and report a lower bound
+PATHINFO_MAX_FILES = 100_000
+
+
+# Recent pathinfo results, keyed on (resolved path, its st_mtime_ns). Only the
+# top-level mtime is checked, so changes deeper in the tree can be missed
+# until something directly under the path changes.
+PATHINFO_CACHE_SIZE = 64
+_PATHINFO_CACHE: "OrderedDict[Tuple[str, int], dict]" = OrderedDict()
+
+# Directory walks are dominated by syscall latency, so threads overlap well
+PATHINFO_WORKERS = 32
+
+
+def _scan_dir(path: str) -> Tuple[int, int, List[str]]:
+    """Return (total size, file count, subdirectories) for one directory level."""
+    total_size = 0
+    file_count = 0
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                        file_count += 1
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return total_size, file_count, subdirs
+
+
+def _walk_parallel(root: str) -> Tuple[int, int, bool]:
+    """Sum file sizes under root, scanning directories on a thread pool.
+
+    Returns (total size, file count, truncated). Each worker returns its own
+    totals and they are merged here, so no locking is needed.
+    """
+    total_size = 0
+    file_count = 0
+    with ThreadPoolExecutor(max_workers=PATHINFO_WORKERS) as pool:
+        pending = {pool.submit(_scan_dir, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                size, count, subdirs = future.result()
+                total_size += size
+                file_count += count
+                pending.update(pool.submit(_scan_dir, d) for d in subdirs)
+            if file_count >= PATHINFO_MAX_FILES:
+                for future in pending:
+                    future.cancel()
+                return total_size, file_count, True
+    return total_size, file_count, False
+
+
 @app.post("/search/pathinfo")
 async def path_info(request: PathInfoRequest):
     """Return resolved path, total size, file count, and estimated search time."""
@@ -421,31 +815,42 @@ async def path_info(request: PathInfoRequest):
         safe_path = validate_search_path(request.search_path)
         resolved = Path(safe_path)
 
+        cache_key = (safe_path, os.stat(safe_path).st_mtime_ns)
+        cached = _PATHINFO_CACHE.get(cache_key)
+        if cached is not None:
+            _PATHINFO_CACHE.move_to_end(cache_key)
+            return cached
+
         total_size = 0
         file_count = 0
+        truncated = False
 
         if resolved.is_file():
             total_size = resolved.stat().st_size
             file_count = 1
         elif resolved.is_dir():
-            for f in resolved.rglob("*"):
-                if f.is_file():
-                    try:
-                        total_size += f.stat().st_size
-                        file_count += 1
-                    except (PermissionError, OSError):
-                        continue
+            loop = asyncio.get_running_loop()
+            total_size, file_count, truncated = await loop.run_in_executor(
+                None, _walk_parallel, safe_path
+            )
 
         # 10k RPM disk: ~150 MB/s sequential read
         disk_speed_bps = 150 * 1024 * 1024
         est_seconds = total_size / disk_speed_bps if total_size > 0 else 0
 
-        return {
+        result = {
             "resolved_path": safe_path,
             "total_size_bytes": total_size,
             "file_count": file_count,
             "est_search_seconds": round(est_seconds, 2),
+            "truncated": truncated,
         }
+
+        _PATHINFO_CACHE[cache_key] = result
+        if len(_PATHINFO_CACHE) > PATHINFO_CACHE_SIZE:
+            _PATHINFO_CACHE.popitem(last=False)
+
+        return result
     except HTTPException:
         raise
     except Exception as e: